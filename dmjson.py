@@ -1,4 +1,10 @@
 import time
+import sys
+import argparse
+import html
+import hashlib
+import threading
+import traceback
 import requests
 import urllib3
 import os
@@ -8,9 +14,14 @@ import random
 import asyncio
 import pandas as pd
 import numpy as np
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from datetime import datetime, timedelta
+from urllib.parse import urlsplit, parse_qs
 from telethon import TelegramClient, events, Button
+from telethon.errors import FloodWaitError, MessageNotModifiedError
 from dotenv import load_dotenv
+import wingo_ml
 
 # Load environment variables from .env file
 load_dotenv()
@@ -18,12 +29,12 @@ load_dotenv()
 # ================= CONFIGURATION =================
 
 # 1. TELETHON SETUP
-API_ID = int(os.getenv('API_ID'))
+API_ID = int(os.getenv('API_ID', '0'))
 API_HASH = os.getenv('API_HASH')
 
 # 2. BOT SETUP
 BOT_TOKEN = os.getenv('BOT_TOKEN')
-ADMIN_ID = int(os.getenv('ADMIN_ID'))
+ADMIN_ID = int(os.getenv('ADMIN_ID', '0'))
 
 # 3. CHANNEL SETUP
 CHANNELS = {
@@ -32,11 +43,21 @@ CHANNELS = {
     "TEST CHANNEL": os.getenv('TEST_CHANNEL', '@your_test_channel')
 }
 SESSION_NAME = 'wingo_aggressive_bot'
+# Extra userbot accounts for channel posting, comma separated (each must be admin in the channels)
+USERBOT_SESSIONS = [name.strip() for name in os.getenv('USERBOT_SESSIONS', SESSION_NAME).split(',') if name.strip()]
 
 # 4. STICKER SETUP (3 win images for random selection)
 WIN_STICKERS = ["win1.webp", "win2.webp", "win3.webp"]
 PREDICTION_END_IMAGE = "Predaction End.webp" 
 
+# 5. LOCAL HTTP API (read-only, disabled unless API_PORT is set)
+API_HOST = os.getenv('API_HOST', '127.0.0.1')
+API_PORT = int(os.getenv('API_PORT', '0'))
+
+# 6. SHARED DRAW CACHE (opt-in, for several copies running on one host)
+SHARED_DRAW_CACHE = os.getenv('SHARED_DRAW_CACHE', '0') == '1'
+SHARED_DRAW_PORT = int(os.getenv('SHARED_DRAW_PORT', '8765'))
+
 # ================= GAME CONFIG =================
 API_PATH = "/WinGo/WinGo_1M/GetHistoryIssuePage.json"
 DOMAINS = [
@@ -77,13 +98,53 @@ system_state = {
     "daily_announcements": []
 }
 
+# ================= CLOCK =================
+
+class SystemClock:
+    """Wall clock. The simulator swaps in a VirtualClock."""
+
+    def now(self): return datetime.now()
+
+    def utcnow(self): return datetime.utcnow()
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(seconds)
+
+class SimulationFinished(BaseException):
+    """End of a simulated run (BaseException so game_loop's error handler lets it through)"""
+
+class VirtualClock:
+    """
+    Simulated time starting at `start` (UTC). sleep() moves the clock forward
+    instead of waiting; with speed > 0 it also yields seconds / speed of real
+    time, otherwise it runs as fast as the code allows. The simulated host's
+    local time is IST, so log() lines match the IST times in the post log.
+    """
+
+    def __init__(self, start, end=None, speed=0):
+        self.current = start
+        self.end = end
+        self.speed = speed
+
+    def now(self): return self.current + timedelta(hours=5, minutes=30)
+
+    def utcnow(self): return self.current
+
+    async def sleep(self, seconds):
+        self.current += timedelta(seconds=seconds)
+        if self.end and self.current >= self.end:
+            raise SimulationFinished()
+        await asyncio.sleep(seconds / self.speed if self.speed else 0)
+
+clock = SystemClock()
+
 # ================= HELPER FUNCTIONS =================
 
 def log(msg):
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] {msg}")
+    print(f"[{clock.now().strftime('%H:%M:%S')}] {msg}")
 
 def get_ist_time():
-    utc_now = datetime.utcnow()
+    utc_now = clock.utcnow()
     ist_now = utc_now + timedelta(hours=5, minutes=30)
     return ist_now
 
@@ -102,21 +163,97 @@ def check_posting_status():
             return False, f"⏳ AUTO OFF (Wait: {system_state['start_time']})"
     return False, "UNKNOWN"
 
+HISTORY_LIMIT = 2000
+
 def init_db():
     conn = sqlite3.connect(DB_FILE)
     cursor = conn.cursor()
+    migrate_db(conn)
+    # size/color/time are derived from number/ts on read (see draw_from_row)
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS wingo_history (
-            period TEXT PRIMARY KEY,
-            number INTEGER,
-            size TEXT,
-            color TEXT,
-            time TEXT
+            period INTEGER PRIMARY KEY,
+            number INTEGER NOT NULL,
+            ts INTEGER NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS wingo_features (
+            period INTEGER PRIMARY KEY,
+            features BLOB
         )
     ''')
     conn.commit()
     conn.close()
 
+def migrate_db(conn):
+    """Convert a DB with the old all-TEXT wingo_history (and its feature table) to the compact schema"""
+    columns = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(wingo_history)")}
+    if columns.get('period') != 'TEXT': return
+    size_before = os.path.getsize(DB_FILE)
+    conn.execute('ALTER TABLE wingo_history RENAME TO wingo_history_old')
+    conn.execute('''
+        CREATE TABLE wingo_history (
+            period INTEGER PRIMARY KEY,
+            number INTEGER NOT NULL,
+            ts INTEGER NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    # Old times are local 'YYYY-MM-DD HH:MM:SS'; the 'utc' modifier turns them into epoch seconds
+    conn.execute('''
+        INSERT OR REPLACE INTO wingo_history (period, number, ts)
+        SELECT CAST(period AS INTEGER), number, COALESCE(CAST(strftime('%s', time, 'utc') AS INTEGER), 0)
+        FROM wingo_history_old
+    ''')
+    conn.execute('DROP TABLE wingo_history_old')
+    conn.execute('DROP TABLE IF EXISTS wingo_features')  # rebuilt by init_feature_store()
+    conn.commit()
+    conn.execute('VACUUM')
+    log(f"🗜 Migrated wingo_history to compact schema ({size_before // 1024} KB -> {os.path.getsize(DB_FILE) // 1024} KB)")
+
+# Rolling features and pattern counts for the newest draw, advanced by save_to_db()
+PATTERN_MAX_K = 8
+feature_tracker = wingo_ml.FeatureTracker()
+size_patterns = wingo_ml.PatternIndex(2, PATTERN_MAX_K, HISTORY_LIMIT)
+color_patterns = wingo_ml.PatternIndex(3, PATTERN_MAX_K, HISTORY_LIMIT)
+
+def push_patterns(number):
+    size_patterns.push(1 if number >= 5 else 0)
+    color_patterns.push(wingo_ml.color_code(number))
+
+def track_features(cursor, period, number):
+    """O(1) feature update for a draw newer than anything tracked so far; True if it was new"""
+    if feature_tracker.last_period and int(period) <= int(feature_tracker.last_period): return False
+    feature_tracker.push(number, period)
+    push_patterns(number)
+    if feature_tracker.ready:
+        cursor.execute('INSERT OR REPLACE INTO wingo_features (period, features) VALUES (?, ?)',
+                       (int(period), wingo_ml.pack_features(feature_tracker.vector())))
+    return True
+
+def init_feature_store():
+    """Rebuild the tracker and pattern indexes from the stored history, backfilling any missing feature rows once"""
+    try:
+        conn = sqlite3.connect(DB_FILE)
+        cursor = conn.cursor()
+        rows = cursor.execute('''
+            SELECT h.period, h.number, f.period IS NOT NULL FROM wingo_history h
+            LEFT JOIN wingo_features f ON f.period = h.period
+            ORDER BY h.period
+        ''').fetchall()
+        missing = any(not stored for _, _, stored in rows[wingo_ml.HISTORY_WINDOW - 1:])
+        tracker_from = 0 if missing else len(rows) - wingo_ml.HISTORY_WINDOW
+        for i, (period, number, _) in enumerate(rows):
+            if missing: track_features(cursor, period, number)
+            else:
+                push_patterns(number)
+                if i >= tracker_from: feature_tracker.push(number, period)
+        conn.commit()
+        conn.close()
+        if missing: log(f"🧮 Feature table rebuilt from {len(rows)} draws")
+    except Exception as e:
+        log(f"⚠️ Feature store error: {e}")
+
 def save_to_db(data_list):
     if not data_list: return
     try:
@@ -124,20 +261,22 @@ def save_to_db(data_list):
         cursor = conn.cursor()
         
         for data in data_list:
+            ts = int(datetime.strptime(data['time'], '%Y-%m-%d %H:%M:%S').timestamp())
             cursor.execute('''
-                INSERT OR REPLACE INTO wingo_history (period, number, size, color, time)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (data['period'], data['number'], data['size'], data['color'], data['time']))
+                INSERT OR REPLACE INTO wingo_history (period, number, ts)
+                VALUES (?, ?, ?)
+            ''', (int(data['period']), data['number'], ts))
+            if track_features(cursor, data['period'], data['number']):
+                recent_draws.appendleft(data)
         
-        # Keep only last 2000 records
-        cursor.execute('SELECT COUNT(*) FROM wingo_history')
-        count = cursor.fetchone()[0]
-        if count > 2000:
-            cursor.execute('''
-                DELETE FROM wingo_history WHERE period IN (
-                    SELECT period FROM wingo_history ORDER BY period ASC LIMIT ?
-                )
-            ''', (count - 2000,))
+        # Keep only the last HISTORY_LIMIT records (one range delete on the integer key)
+        cursor.execute('''
+            DELETE FROM wingo_history WHERE period <= (
+                SELECT period FROM wingo_history ORDER BY period DESC LIMIT 1 OFFSET ?
+            )
+        ''', (HISTORY_LIMIT,))
+        if cursor.rowcount > 0:
+            cursor.execute('DELETE FROM wingo_features WHERE period < (SELECT MIN(period) FROM wingo_history)')
         
         conn.commit()
         conn.close()
@@ -147,9 +286,9 @@ def read_from_db():
     """Read all data from database as DataFrame"""
     try:
         conn = sqlite3.connect(DB_FILE)
-        df = pd.read_sql_query('SELECT * FROM wingo_history ORDER BY period', conn)
+        rows = conn.execute('SELECT period, number, ts FROM wingo_history ORDER BY period').fetchall()
         conn.close()
-        return df
+        return pd.DataFrame([draw_from_row(*row) for row in rows], columns=['period', 'number', 'size', 'color', 'time'])
     except:
         return pd.DataFrame(columns=['period', 'number', 'size', 'color', 'time'])
 
@@ -158,6 +297,14 @@ def get_color(n):
     if n in (1, 3, 7, 9): return "🟢 Green"
     return "🔴 Red"
 
+def draw_from_row(period, number, ts):
+    """Stored (period, number, ts) -> the draw dict used everywhere else"""
+    return {
+        "period": str(period), "number": number,
+        "size": 'Big' if number >= 5 else 'Small', "color": get_color(number),
+        "time": datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
+    }
+
 def load_accuracy():
     if os.path.exists(ACCURACY_FILE):
         try:
@@ -245,40 +392,184 @@ def check_daily_announcements():
     
     return announcements_to_send
 
-# ================= WARM UP =================
-def warm_up_system():
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] 🔥 Warming up... Downloading 1000+ past results...")
-    collected_data = []
-    for page in range(1, 101): 
-        success = False
+# ================= DRAW SOURCE =================
+
+class ApiDrawSource:
+    """Draw history from the game API. The simulator swaps in a SyntheticDrawSource."""
+
+    def fetch_page(self, page=1, timeout=5):
+        """History page `page` (newest first) from the first domain that answers"""
         for domain in DOMAINS:
             try:
                 p = PARAMS.copy()
                 p['no'] = page
                 p['ts'] = str(int(time.time() * 1000))
-                r = requests.get(domain + API_PATH, params=p, headers=HEADERS, timeout=3, verify=False)
+                r = requests.get(domain + API_PATH, params=p, headers=HEADERS, timeout=timeout, verify=False)
                 if r.status_code == 200:
-                    data = r.json()
-                    if "data" in data and "list" in data["data"]:
-                        for item in data["data"]["list"]:
-                            period = str(item["issueNumber"])
-                            number = int(item["number"])
-                            size = 'Big' if number >= 5 else 'Small'
-                            color = get_color(number)
-                            collected_data.append({
-                                "period": period, "number": number, "size": size, 
-                                "color": color, "time": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                            })
-                        success = True
-                        break
+                    temp = r.json()
+                    if "data" in temp and "list" in temp["data"]:
+                        return temp
             except: continue
-        if not success: break
-        if page % 20 == 0: print(f"[{datetime.now().strftime('%H:%M:%S')}] 📥 Downloaded {page * 10} records...")
+        return None
+
+draw_source = ApiDrawSource()
+
+# ================= WARM UP =================
+def warm_up_system():
+    print(f"[{clock.now().strftime('%H:%M:%S')}] 🔥 Warming up... Downloading 1000+ past results...")
+    collected_data = []
+    for page in range(1, 101): 
+        data = draw_source.fetch_page(page, timeout=3)
+        if not data: break
+        for item in data["data"]["list"]:
+            period = str(item["issueNumber"])
+            number = int(item["number"])
+            size = 'Big' if number >= 5 else 'Small'
+            color = get_color(number)
+            collected_data.append({
+                "period": period, "number": number, "size": size, 
+                "color": color, "time": clock.now().strftime('%Y-%m-%d %H:%M:%S')
+            })
+        if page % 20 == 0: print(f"[{clock.now().strftime('%H:%M:%S')}] 📥 Downloaded {page * 10} records...")
 
     if collected_data:
         collected_data.reverse()
         save_to_db(collected_data)
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] ✅ Brain Loaded! Total Database: {len(collected_data)}")
+        print(f"[{clock.now().strftime('%H:%M:%S')}] ✅ Brain Loaded! Total Database: {len(collected_data)}")
+    return collected_data
+
+# ================= SHARED DRAW CACHE =================
+
+class SharedDrawCache:
+    """
+    One upstream poll for every bot copy on this host.
+    The first instance to bind the local port becomes the fetcher and pushes
+    each new page to the others, which connect as followers. Only the fetcher
+    runs the warm-up download; each follower receives those rows as the first
+    line after connecting. If the fetcher goes away, the followers re-run the
+    election and one of them takes over.
+    """
+
+    def __init__(self, port):
+        self.port = port
+        self.is_fetcher = False
+        self.latest = None
+        self.warm_up_rows = None
+        self._latest_period = None
+        self._subscribers = set()
+        self._server = None
+        self._follow_task = None
+        self._new_page = None
+        self._warm_up_ready = None
+
+    async def start(self):
+        self._new_page = asyncio.Event()
+        self._warm_up_ready = asyncio.Event()
+        await self._elect()
+
+    def close(self):
+        if self._server: self._server.close()
+        for writer in list(self._subscribers):
+            writer.close()
+
+    def set_warm_up(self, rows):
+        """Warm-up rows handed to every follower that connects"""
+        self.warm_up_rows = rows
+        self._warm_up_ready.set()
+
+    async def _elect(self):
+        while True:
+            try:
+                self._server = await asyncio.start_server(self._on_subscriber, '127.0.0.1', self.port)
+                self.is_fetcher = True
+                # A follower promoted after the old fetcher died passes on the rows it received
+                if self.warm_up_rows is not None: self._warm_up_ready.set()
+                log(f"🔗 Shared cache: fetching for local instances (port {self.port})")
+                return
+            except OSError:
+                pass
+            try:
+                # The warm-up line is ~100 KB, above StreamReader's default 64 KB line limit
+                reader, writer = await asyncio.open_connection('127.0.0.1', self.port, limit=2 ** 22)
+            except OSError:
+                await clock.sleep(1)
+                continue
+            try:
+                # The fetcher may still be downloading the warm-up; its first line is the result
+                hello = json.loads(await asyncio.wait_for(reader.readline(), 300))
+                self.warm_up_rows = hello["warm_up"]
+            except Exception as e:
+                log(f"⚠️ Shared cache: no warm-up from fetcher ({e}), retrying...")
+                writer.close()
+                await clock.sleep(1)
+                continue
+            self.is_fetcher = False
+            self._follow_task = asyncio.ensure_future(self._follow(reader, writer))
+            log(f"🔗 Shared cache: following local fetcher (port {self.port})")
+            return
+
+    async def _on_subscriber(self, reader, writer):
+        await self._warm_up_ready.wait()
+        writer.write((json.dumps({"warm_up": self.warm_up_rows}) + "\n").encode())
+        if self.latest:
+            writer.write((json.dumps(self.latest) + "\n").encode())
+        self._subscribers.add(writer)
+        try:
+            await reader.read()
+        except: pass
+        self._subscribers.discard(writer)
+        writer.close()
+
+    async def _follow(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line: break
+                self.latest = json.loads(line)
+                self._new_page.set()
+        except Exception as e:
+            log(f"⚠️ Shared cache error: {e}")
+        writer.close()
+        log("🔗 Shared cache: fetcher gone, re-electing...")
+        await self._elect()
+
+    def publish(self, data):
+        """Push a freshly fetched page to followers, once per new period"""
+        period = str(data["data"]["list"][0]["issueNumber"])
+        self.latest = data
+        if period == self._latest_period: return
+        self._latest_period = period
+        line = (json.dumps(data) + "\n").encode()
+        for writer in list(self._subscribers):
+            try: writer.write(line)
+            except: self._subscribers.discard(writer)
+
+    async def wait(self, seconds):
+        """Sleep until the next cycle; followers wake early when a page arrives"""
+        if self.is_fetcher:
+            await clock.sleep(seconds)
+            return
+        try:
+            await asyncio.wait_for(self._new_page.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._new_page.clear()
+
+draw_cache = SharedDrawCache(SHARED_DRAW_PORT) if SHARED_DRAW_CACHE else None
+
+async def get_history_page():
+    if draw_cache and not draw_cache.is_fetcher:
+        return draw_cache.latest
+    data = draw_source.fetch_page()
+    if data and draw_cache:
+        draw_cache.publish(data)
+    return data
+
+async def wait_next_cycle(seconds):
+    if draw_cache:
+        await draw_cache.wait(seconds)
+    else:
+        await clock.sleep(seconds)
 
 # ================= 🎯 SIMPLE TREND FOLLOWING =================
 
@@ -288,252 +579,448 @@ def simple_trend_follow(last_size):
     """
     return last_size, 75.0
 
-# ================= TELETHON CLIENTS =================
+# ================= 🤖 GRADIENT BOOSTING =================
 
-bot = TelegramClient('bot_control_agg', API_ID, API_HASH).start(bot_token=BOT_TOKEN)
-userbot = TelegramClient(SESSION_NAME, API_ID, API_HASH)
+ML_RETRAIN_EVERY = 30  # new draws between background retrains
 
-# ================= CONTROL PANEL =================
-# ... (Same Panel Logic) ...
-async def get_panel_message():
-    _, status_msg = check_posting_status()
-    ist_time = get_ist_time().strftime('%H:%M:%S')
-    schedule_count = len(system_state["daily_schedules"])
-    announcement_count = len(system_state["daily_announcements"])
-    msg = (
-        f"🎛 <b>AGGRESSIVE AI PANEL</b>\n\n"
-        f"📢 <b>Target:</b> {system_state['active_channel_name']}\n"
-        f"🎮 <b>Game:</b> {system_state['game_name']}\n"
-        f"📡 <b>Status:</b> {status_msg}\n"
-        f"📅 <b>Daily Schedules:</b> {schedule_count}\n"
-        f"📣 <b>Announcements:</b> {announcement_count}\n"
-        f"🕒 <b>Time:</b> <code>{ist_time}</code>"
-    )
-    return msg
+ml_state = {
+    "model": None,
+    "pending": None,
+    "draws_since_train": 0
+}
+ml_pool = None
+
+def start_ml_retrain():
+    """Retrain in a worker process; the Telethon loop only awaits the future"""
+    global ml_pool
+    if ml_state["pending"]: return
+    if ml_pool is None:
+        ml_pool = ProcessPoolExecutor(max_workers=1)
+    ml_state["draws_since_train"] = 0
+    loop = asyncio.get_event_loop()
+    ml_state["pending"] = loop.run_in_executor(ml_pool, wingo_ml.train_from_db, DB_FILE, ml_state["model"])
+
+def swap_ml_model():
+    """Install a finished retrain. Only called between periods, so one draw never mixes two models."""
+    future = ml_state["pending"]
+    if not future or not future.done(): return
+    ml_state["pending"] = None
+    try:
+        model = future.result()
+    except Exception as e:
+        log(f"⚠️ ML retrain failed: {e}")
+        return
+    if not model: return
+    if model["accepted"]:
+        ml_state["model"] = model
+        log(f"🤖 New model live: {model['val_acc']:.1%} vs trend {model['baseline_acc']:.1%} ({model['samples']} draws)")
+    else:
+        log(f"🤖 Retrained model rejected: {model['val_acc']:.1%} vs trend {model['baseline_acc']:.1%}")
+        # The live model was scored on the same fresh hold-out; drop it once it loses to trend
+        prev_acc = model["prev_acc"]
+        if ml_state["model"] and prev_acc is not None and prev_acc < model["baseline_acc"]:
+            ml_state["model"] = None
+            log(f"🤖 Live model retired: {prev_acc:.1%} vs trend {model['baseline_acc']:.1%}, falling back")
+
+# ================= 🔁 PATTERN MATCHING =================
+
+PATTERN_MIN_SUPPORT = 8  # times a suffix must have been seen before its counts are trusted
+PATTERN_MIN_EDGE = 0.6   # share of the majority outcome needed to bet on a pattern
+
+def pattern_prediction():
+    """What followed the longest well-supported Big/Small suffix: (pred, conf, logic) or None"""
+    k, counts = size_patterns.best_match(PATTERN_MIN_SUPPORT)
+    if not k: return None
+    small, big = counts
+    share = max(big, small) / (big + small)
+    if share < PATTERN_MIN_EDGE: return None
+    return ("Big" if big > small else "Small"), share * 100, f"🔁 Pattern (last {k}: {big}B/{small}S)"
+
+def color_pattern_note():
+    k, counts = color_patterns.best_match(PATTERN_MIN_SUPPORT)
+    if not k: return ""
+    names = ("Green", "Red", "Violet")
+    best = max(range(3), key=lambda c: counts[c])
+    return f"\n🎨 After last {k} colors: {names[best]} {counts[best]}/{sum(counts)}"
+
+def predict_next(last_size):
+    """Validated ML model first, then a strong history pattern, then trend following"""
+    model = ml_state["model"]
+    if model and feature_tracker.ready:
+        p_big = wingo_ml.predict_proba(model, feature_tracker.vector())
+        if p_big >= 0.5: return "Big", p_big * 100, "🤖 Gradient Boosting"
+        return "Small", (1 - p_big) * 100, "🤖 Gradient Boosting"
+    pattern = pattern_prediction()
+    if pattern: return pattern
+    final_pred, final_conf = simple_trend_follow(last_size)
+    return final_pred, final_conf, "📈 Trend Following"
 
-@bot.on(events.NewMessage(pattern='/control'))
-async def send_control_panel(event):
-    if event.sender_id != ADMIN_ID: return
-    msg = await get_panel_message()
-    keyboards = [
-        [Button.inline("🟢 FORCE START", b'force_start'), Button.inline("🔴 FORCE STOP", b'force_stop')],
-        [Button.inline("⏰ AUTO SCHEDULE", b'auto_mode'), Button.inline("📢 SELECT CHANNEL", b'select_channel')],
-        [Button.inline("🎮 CHANGE GAME NAME", b'change_game'), Button.inline("✏️ SET TIME", b'set_time')],
-        [Button.inline("🔧 SOLVE PROBLEM", b'solve_problem'), Button.inline("📅 VIEW SCHEDULES", b'view_schedules')],
-        [Button.inline("📣 ANNOUNCEMENT", b'announcement'), Button.inline("👁️ VIEW ANNOUNCEMENTS", b'view_announcements')]
-    ]
-    await event.respond(msg, buttons=keyboards, parse_mode='html')
+# ================= TELETHON CLIENTS =================
 
-# ... (Callback Handlers and Input Handlers Same as before) ...
-@bot.on(events.CallbackQuery)
-async def handler(event):
-    if event.sender_id != ADMIN_ID: return
-    data = event.data
-    
-    if data == b'force_start':
-        system_state["mode"] = "manual_on"
-        system_state["stopped_by_losses"] = False
-        system_state["consecutive_losses"] = 0
-        await event.answer("🟢 Force Started!", alert=True)
+POOL_REBALANCE_GAP = 2  # in-flight sends by which a channel's own session may exceed the idlest one
+POOL_MAX_WAIT = 60      # when every session is blocked, wait up to this long (Telethon's old default) before dropping a post
 
-    elif data == b'force_stop':
-        system_state["mode"] = "manual_off"
-        await event.answer("🔴 Force Stopped!", alert=True)
+class UserbotPool:
+    """
+    Several userbot accounts behind the send_message/send_file calls of one.
+    Each channel sticks to one session, spread by how many channels each
+    already serves. A busy session's posts spill over to an idle one, and a
+    session in FloodWait or disconnected is skipped until it recovers.
+    """
 
-    elif data == b'auto_mode':
-        if not system_state["start_time"]: await event.answer("⚠️ Set Time First!", alert=True)
-        else:
-            system_state["mode"] = "auto_time"
-            system_state["stopped_by_losses"] = False
-            system_state["consecutive_losses"] = 0
-            await event.answer("⏰ Auto Mode ON", alert=True)
-
-    elif data == b'select_channel':
-        buttons = []
-        for name in CHANNELS.keys():
-            buttons.append([Button.inline(f"📡 {name}", data=f"ch_{name}".encode())])
-        buttons.append([Button.inline("🔙 BACK", b'back_main')])
-        await event.edit("📢 <b>Select Target Channel:</b>", buttons=buttons, parse_mode='html')
-        return
+    def __init__(self, names):
+        self.names = names
+        # flood_sleep_threshold=0: surface every FloodWait to _send instead of sleeping inside Telethon
+        self.clients = [TelegramClient(name, API_ID, API_HASH, flood_sleep_threshold=0) for name in names]
+        self._affinity = {}
+        self._busy = [0] * len(names)
+        self._blocked_until = [0.0] * len(names)
+        self._reconnecting = set()
+
+    async def start(self):
+        for client in self.clients:
+            await client.start()
+        log(f"👥 Userbot pool: {len(self.clients)} session(s)")
+
+    async def disconnect(self):
+        for client in self.clients:
+            await client.disconnect()
+
+    def _healthy(self, i):
+        return self.clients[i].is_connected() and time.monotonic() >= self._blocked_until[i]
+
+    def _pick(self, key, tried):
+        for i, client in enumerate(self.clients):
+            if not client.is_connected(): self._start_reconnect(i)
+        candidates = [i for i in range(len(self.clients)) if i not in tried and self._healthy(i)]
+        if not candidates: return None
+        idlest = min(candidates, key=lambda i: self._busy[i])
+        pinned = self._affinity.get(key)
+        if pinned in candidates:
+            if self._busy[pinned] - self._busy[idlest] < POOL_REBALANCE_GAP: return pinned
+            return idlest
+        load = [list(self._affinity.values()).count(i) for i in range(len(self.clients))]
+        self._affinity[key] = min(candidates, key=lambda i: (load[i], self._busy[i]))
+        return self._affinity[key]
+
+    def _start_reconnect(self, i):
+        if i in self._reconnecting: return
+        self._reconnecting.add(i)
+        task = asyncio.ensure_future(self._reconnect(i))
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+
+    async def _reconnect(self, i):
+        """Retry a dropped session with back-off until it is back; _pick skips it meanwhile"""
+        client = self.clients[i]
+        delay = 5
+        try:
+            while not client.is_connected():
+                try: await client.connect()
+                except Exception as e: log(f"⚠️ Session {self.names[i]} reconnect failed: {e}")
+                if client.is_connected(): break
+                self._blocked_until[i] = time.monotonic() + delay
+                await clock.sleep(delay)
+                delay = min(delay * 2, 300)
+            log(f"🔌 Session {self.names[i]} connected")
+        finally:
+            self._reconnecting.discard(i)
+
+    async def _send(self, method, entity, *args, **kwargs):
+        key = str(entity)
+        tried = set()
+        last_error = None
+        waited = 0
+        while True:
+            i = self._pick(key, tried)
+            if i is None:
+                # Every session is blocked: wait for the first one to come back, like Telethon
+                # used to sleep through short FloodWaits, instead of dropping the post
+                wait = max(min(self._blocked_until) - time.monotonic(), 1)
+                if waited + wait > POOL_MAX_WAIT:
+                    raise last_error or ConnectionError("No userbot session available")
+                log(f"⏳ All userbot sessions blocked, retrying in {wait:.0f}s")
+                await clock.sleep(wait)
+                waited += wait
+                tried.clear()
+                continue
+            tried.add(i)
+            self._busy[i] += 1
+            try:
+                return await getattr(self.clients[i], method)(entity, *args, **kwargs)
+            except FloodWaitError as e:
+                self._blocked_until[i] = time.monotonic() + e.seconds
+                log(f"⏳ Session {self.names[i]} in FloodWait ({e.seconds}s), failing over")
+                last_error = e
+            except ConnectionError as e:
+                log(f"⚠️ Session {self.names[i]} disconnected, failing over")
+                self._blocked_until[i] = time.monotonic() + 5
+                self._start_reconnect(i)
+                last_error = e
+            finally:
+                self._busy[i] -= 1
+
+    async def send_message(self, entity, message, **kwargs):
+        return await self._send('send_message', entity, message, **kwargs)
+
+    async def send_file(self, entity, file, **kwargs):
+        return await self._send('send_file', entity, file, **kwargs)
+
+# Created by create_clients() for live runs only, so importing this file (ML workers,
+# --simulate) never opens the session files; simulations use RecordingClient instead
+bot = None
+userbot = None
+
+def create_clients():
+    global bot, userbot
+    bot = TelegramClient('bot_control_agg', API_ID, API_HASH)
+    userbot = UserbotPool(USERBOT_SESSIONS)
+    bot.add_event_handler(send_control_panel, events.NewMessage(pattern='/control'))
+    bot.add_event_handler(send_lag_report, events.NewMessage(pattern='/lag'))
+    bot.add_event_handler(handler, events.CallbackQuery)
+    bot.add_event_handler(input_handler, events.NewMessage)
 
-    elif data.startswith(b'ch_'):
-        selected_name = data.decode().replace("ch_", "")
-        if selected_name in CHANNELS:
-            system_state["active_channel_name"] = selected_name
-            system_state["active_channel_link"] = CHANNELS[selected_name]
-            await event.answer(f"✅ Selected: {selected_name}", alert=True)
-            msg = await get_panel_message()
-            keyboards = [
-                [Button.inline("🟢 FORCE START", b'force_start'), Button.inline("🔴 FORCE STOP", b'force_stop')],
-                [Button.inline("⏰ AUTO SCHEDULE", b'auto_mode'), Button.inline("📢 SELECT CHANNEL", b'select_channel')],
-                [Button.inline("🎮 CHANGE GAME NAME", b'change_game'), Button.inline("✏️ SET TIME", b'set_time')]
-            ]
-            await event.edit(msg, buttons=keyboards, parse_mode='html')
-            return
+# ================= CONTROL PANEL =================
 
-    elif data == b'change_game':
-        system_state["waiting_for_name"] = True
-        await event.respond("🎮 Enter Game Name:", parse_mode='html')
-        return
+PANEL_COALESCE_SECONDS = 0.3  # presses on one panel within this window become one edit
 
-    elif data == b'set_time':
-        system_state["waiting_for_input"] = True
-        await event.respond("✏️ Enter Time (e.g. 19:00-19:20)", parse_mode='html')
-        return
+BACK_ROW = [Button.inline("🔙 BACK", b'back_main')]
+MAIN_KEYBOARD = [
+    [Button.inline("🟢 FORCE START", b'force_start'), Button.inline("🔴 FORCE STOP", b'force_stop')],
+    [Button.inline("⏰ AUTO SCHEDULE", b'auto_mode'), Button.inline("📢 SELECT CHANNEL", b'select_channel')],
+    [Button.inline("🎮 CHANGE GAME NAME", b'change_game'), Button.inline("✏️ SET TIME", b'set_time')],
+    [Button.inline("🔧 SOLVE PROBLEM", b'solve_problem'), Button.inline("📅 VIEW SCHEDULES", b'view_schedules')],
+    [Button.inline("📣 ANNOUNCEMENT", b'announcement'), Button.inline("👁️ VIEW ANNOUNCEMENTS", b'view_announcements')]
+]
+CHANNEL_KEYBOARD = [[Button.inline(f"📡 {name}", data=f"ch_{name}".encode())] for name in CHANNELS] + [BACK_ROW]
 
-    elif data == b'solve_problem':
-        system_state["waiting_for_manual_schedule"] = True
-        await event.respond(
-            "🔧 <b>SOLVE PROBLEM - Set Daily Schedule</b>\n\n"
-            "Enter in format:\n"
-            "<code>START|END|GAME</code>\n\n"
-            "Examples:\n"
-            "<code>19:30|19:50|BDG</code>\n"
-            "<code>20:15|20:45|DAMAN</code>\n\n"
-            "Or without end time:\n"
-            "<code>19:30|BDG</code>\n\n"
-            "This will run automatically every day!",
-            parse_mode='html'
-        )
-        return
+panel_render_cache = {}  # view name -> (state key, text, buttons)
+panel_shown = {}         # (chat_id, msg_id) -> state key currently on screen
+panel_pending = {}       # (chat_id, msg_id) -> (event, view) waiting to be flushed
 
-    elif data == b'announcement':
-        system_state["waiting_for_announcement"] = True
-        await event.respond(
-            "📣 <b>DAILY ANNOUNCEMENT</b>\n\n"
-            "Enter in format:\n"
-            "<code>TIME|MESSAGE</code>\n\n"
-            "Examples:\n"
-            "<code>19:00|🎮 Game starting in 30 minutes!</code>\n"
-            "<code>20:00|💰 Big win incoming! Join now!</code>\n\n"
-            "This will be sent automatically every day!",
-            parse_mode='html'
+def cached_render(name, key, build):
+    """Re-render a view only when the state it shows has changed"""
+    hit = panel_render_cache.get(name)
+    if hit and hit[0] == (name, key): return hit
+    text, buttons = build()
+    panel_render_cache[name] = ((name, key), text, buttons)
+    return panel_render_cache[name]
+
+def view_main():
+    _, status_msg = check_posting_status()
+    ist_time = get_ist_time().strftime('%H:%M')
+    key = (system_state['active_channel_name'], system_state['game_name'], status_msg,
+           len(system_state["daily_schedules"]), len(system_state["daily_announcements"]), ist_time)
+    def build():
+        msg = (
+            f"🎛 <b>AGGRESSIVE AI PANEL</b>\n\n"
+            f"📢 <b>Target:</b> {system_state['active_channel_name']}\n"
+            f"🎮 <b>Game:</b> {system_state['game_name']}\n"
+            f"📡 <b>Status:</b> {status_msg}\n"
+            f"📅 <b>Daily Schedules:</b> {key[3]}\n"
+            f"📣 <b>Announcements:</b> {key[4]}\n"
+            f"🕒 <b>Time:</b> <code>{ist_time}</code>"
         )
-        return
+        return msg, MAIN_KEYBOARD
+    return cached_render("main", key, build)
 
-    elif data == b'view_announcements':
-        if not system_state["daily_announcements"]:
-            await event.answer("📣 No announcements set yet!", alert=True)
-            return
-        
+def view_channels():
+    return cached_render("channels", (), lambda: ("📢 <b>Select Target Channel:</b>", CHANNEL_KEYBOARD))
+
+def view_announcements():
+    key = tuple((ann['time'], ann['message']) for ann in system_state["daily_announcements"])
+    def build():
         ann_msg = "📣 <b>DAILY ANNOUNCEMENTS</b>\n\n"
-        for idx, ann in enumerate(system_state["daily_announcements"], 1):
-            preview = ann['message'][:50] + "..." if len(ann['message']) > 50 else ann['message']
-            ann_msg += f"{idx}. ⏰ <code>{ann['time']}</code>\n   📝 {preview}\n\n"
-        
-        buttons = []
-        for idx, ann in enumerate(system_state["daily_announcements"]):
-            buttons.append([Button.inline(f"❌ Delete #{idx+1}", data=f"del_ann_{idx}".encode())])
-        buttons.append([Button.inline("🔙 BACK", b'back_main')])
-        
-        await event.edit(ann_msg, buttons=buttons, parse_mode='html')
-        return
+        for idx, (at, message) in enumerate(key, 1):
+            preview = message[:50] + "..." if len(message) > 50 else message
+            ann_msg += f"{idx}. ⏰ <code>{at}</code>\n   📝 {preview}\n\n"
+        buttons = [[Button.inline(f"❌ Delete #{idx+1}", data=f"del_ann_{idx}".encode())] for idx in range(len(key))]
+        return ann_msg, buttons + [BACK_ROW]
+    return cached_render("announcements", key, build)
+
+def view_schedules():
+    key = tuple((sch['time'], sch.get('end_time'), sch['game']) for sch in system_state["daily_schedules"])
+    def build():
+        schedule_msg = "📅 <b>DAILY SCHEDULES</b>\n\n"
+        for idx, (at, end_time, game) in enumerate(key, 1):
+            time_info = f"⏰ <code>{at}</code>"
+            if end_time:
+                time_info += f" → <code>{end_time}</code>"
+            schedule_msg += f"{idx}. {time_info} | 🎮 <b>{game}</b>\n"
+        buttons = [[Button.inline(f"❌ Delete #{idx+1}", data=f"del_sch_{idx}".encode())] for idx in range(len(key))]
+        return schedule_msg, buttons + [BACK_ROW]
+    return cached_render("schedules", key, build)
+
+def request_panel_edit(event, view):
+    """Queue an edit of the pressed panel; presses arriving while one is queued only replace it"""
+    msg_key = (event.chat_id, event.message_id)
+    queued = msg_key in panel_pending
+    panel_pending[msg_key] = (event, view)
+    if not queued:
+        task = asyncio.ensure_future(flush_panel_edit(msg_key))
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+
+async def flush_panel_edit(msg_key):
+    await asyncio.sleep(PANEL_COALESCE_SECONDS)
+    event, view = panel_pending.pop(msg_key)
+    key, text, buttons = view()
+    if panel_shown.get(msg_key) == key: return
+    try:
+        await event.edit(text, buttons=buttons, parse_mode='html')
+        panel_shown[msg_key] = key
+    except MessageNotModifiedError:
+        panel_shown[msg_key] = key
+    except Exception as e:
+        log(f"⚠️ Panel edit error: {e}")
 
-    elif data.startswith(b'del_ann_'):
-        try:
-            idx = int(data.decode().replace("del_ann_", ""))
-            if 0 <= idx < len(system_state["daily_announcements"]):
-                deleted = system_state["daily_announcements"].pop(idx)
-                save_daily_announcements(system_state["daily_announcements"])
-                await event.answer(f"✅ Deleted announcement at {deleted['time']}", alert=True)
-        except:
-            await event.answer("❌ Error deleting announcement", alert=True)
-        
-        # Refresh announcements view
-        if system_state["daily_announcements"]:
-            ann_msg = "📣 <b>DAILY ANNOUNCEMENTS</b>\n\n"
-            for idx, ann in enumerate(system_state["daily_announcements"], 1):
-                preview = ann['message'][:50] + "..." if len(ann['message']) > 50 else ann['message']
-                ann_msg += f"{idx}. ⏰ <code>{ann['time']}</code>\n   📝 {preview}\n\n"
-            
-            buttons = []
-            for idx, ann in enumerate(system_state["daily_announcements"]):
-                buttons.append([Button.inline(f"❌ Delete #{idx+1}", data=f"del_ann_{idx}".encode())])
-            buttons.append([Button.inline("🔙 BACK", b'back_main')])
-            
-            await event.edit(ann_msg, buttons=buttons, parse_mode='html')
-        else:
-            msg = await get_panel_message()
-            keyboards = [
-                [Button.inline("🟢 FORCE START", b'force_start'), Button.inline("🔴 FORCE STOP", b'force_stop')],
-                [Button.inline("⏰ AUTO SCHEDULE", b'auto_mode'), Button.inline("📢 SELECT CHANNEL", b'select_channel')],
-                [Button.inline("🎮 CHANGE GAME NAME", b'change_game'), Button.inline("✏️ SET TIME", b'set_time')],
-                [Button.inline("🔧 SOLVE PROBLEM", b'solve_problem'), Button.inline("📅 VIEW SCHEDULES", b'view_schedules')],
-                [Button.inline("📣 ANNOUNCEMENT", b'announcement'), Button.inline("👁️ VIEW ANNOUNCEMENTS", b'view_announcements')]
-            ]
-            await event.edit(msg, buttons=keyboards, parse_mode='html')
-        return
+async def send_control_panel(event):
+    if event.sender_id != ADMIN_ID: return
+    key, msg, keyboards = view_main()
+    sent = await event.respond(msg, buttons=keyboards, parse_mode='html')
+    panel_shown[(sent.chat_id, sent.id)] = key
+
+# ----- Button actions: each returns the view to show, or None to leave the panel as is -----
+
+async def on_force_start(event):
+    system_state["mode"] = "manual_on"
+    system_state["stopped_by_losses"] = False
+    system_state["consecutive_losses"] = 0
+    await event.answer("🟢 Force Started!", alert=True)
+    return view_main
+
+async def on_force_stop(event):
+    system_state["mode"] = "manual_off"
+    await event.answer("🔴 Force Stopped!", alert=True)
+    return view_main
+
+async def on_auto_mode(event):
+    if not system_state["start_time"]: await event.answer("⚠️ Set Time First!", alert=True)
+    else:
+        system_state["mode"] = "auto_time"
+        system_state["stopped_by_losses"] = False
+        system_state["consecutive_losses"] = 0
+        await event.answer("⏰ Auto Mode ON", alert=True)
+    return view_main
+
+async def on_select_channel(event):
+    return view_channels
+
+async def on_channel_chosen(event, selected_name):
+    if selected_name in CHANNELS:
+        system_state["active_channel_name"] = selected_name
+        system_state["active_channel_link"] = CHANNELS[selected_name]
+        await event.answer(f"✅ Selected: {selected_name}", alert=True)
+    return view_main
+
+async def on_change_game(event):
+    system_state["waiting_for_name"] = True
+    await event.respond("🎮 Enter Game Name:", parse_mode='html')
+
+async def on_set_time(event):
+    system_state["waiting_for_input"] = True
+    await event.respond("✏️ Enter Time (e.g. 19:00-19:20)", parse_mode='html')
+
+async def on_solve_problem(event):
+    system_state["waiting_for_manual_schedule"] = True
+    await event.respond(
+        "🔧 <b>SOLVE PROBLEM - Set Daily Schedule</b>\n\n"
+        "Enter in format:\n"
+        "<code>START|END|GAME</code>\n\n"
+        "Examples:\n"
+        "<code>19:30|19:50|BDG</code>\n"
+        "<code>20:15|20:45|DAMAN</code>\n\n"
+        "Or without end time:\n"
+        "<code>19:30|BDG</code>\n\n"
+        "This will run automatically every day!",
+        parse_mode='html'
+    )
 
-    elif data == b'view_schedules':
-        if not system_state["daily_schedules"]:
-            await event.answer("📅 No schedules set yet!", alert=True)
-            return
-        
-        schedule_msg = "📅 <b>DAILY SCHEDULES</b>\n\n"
-        for idx, sch in enumerate(system_state["daily_schedules"], 1):
-            time_info = f"⏰ <code>{sch['time']}</code>"
-            if "end_time" in sch:
-                time_info += f" → <code>{sch['end_time']}</code>"
-            schedule_msg += f"{idx}. {time_info} | 🎮 <b>{sch['game']}</b>\n"
-        
-        buttons = []
-        for idx, sch in enumerate(system_state["daily_schedules"]):
-            buttons.append([Button.inline(f"❌ Delete #{idx+1}", data=f"del_sch_{idx}".encode())])
-        buttons.append([Button.inline("🔙 BACK", b'back_main')])
-        
-        await event.edit(schedule_msg, buttons=buttons, parse_mode='html')
-        return
+async def on_announcement(event):
+    system_state["waiting_for_announcement"] = True
+    await event.respond(
+        "📣 <b>DAILY ANNOUNCEMENT</b>\n\n"
+        "Enter in format:\n"
+        "<code>TIME|MESSAGE</code>\n\n"
+        "Examples:\n"
+        "<code>19:00|🎮 Game starting in 30 minutes!</code>\n"
+        "<code>20:00|💰 Big win incoming! Join now!</code>\n\n"
+        "This will be sent automatically every day!",
+        parse_mode='html'
+    )
 
-    elif data.startswith(b'del_sch_'):
-        try:
-            idx = int(data.decode().replace("del_sch_", ""))
-            if 0 <= idx < len(system_state["daily_schedules"]):
-                deleted = system_state["daily_schedules"].pop(idx)
-                save_daily_schedules(system_state["daily_schedules"])
-                await event.answer(f"✅ Deleted: {deleted['time']} | {deleted['game']}", alert=True)
-        except:
-            await event.answer("❌ Error deleting schedule", alert=True)
-        
-        # Refresh schedule view
-        if system_state["daily_schedules"]:
-            schedule_msg = "📅 <b>DAILY SCHEDULES</b>\n\n"
-            for idx, sch in enumerate(system_state["daily_schedules"], 1):
-                time_info = f"⏰ <code>{sch['time']}</code>"
-                if "end_time" in sch:
-                    time_info += f" → <code>{sch['end_time']}</code>"
-                schedule_msg += f"{idx}. {time_info} | 🎮 <b>{sch['game']}</b>\n"
-            
-            buttons = []
-            for idx, sch in enumerate(system_state["daily_schedules"]):
-                buttons.append([Button.inline(f"❌ Delete #{idx+1}", data=f"del_sch_{idx}".encode())])
-            buttons.append([Button.inline("🔙 BACK", b'back_main')])
-            
-            await event.edit(schedule_msg, buttons=buttons, parse_mode='html')
-        else:
-            msg = await get_panel_message()
-            keyboards = [
-                [Button.inline("🟢 FORCE START", b'force_start'), Button.inline("🔴 FORCE STOP", b'force_stop')],
-                [Button.inline("⏰ AUTO SCHEDULE", b'auto_mode'), Button.inline("📢 SELECT CHANNEL", b'select_channel')],
-                [Button.inline("🎮 CHANGE GAME NAME", b'change_game'), Button.inline("✏️ SET TIME", b'set_time')],
-                [Button.inline("🔧 SOLVE PROBLEM", b'solve_problem'), Button.inline("📅 VIEW SCHEDULES", b'view_schedules')],
-                [Button.inline("📣 ANNOUNCEMENT", b'announcement'), Button.inline("👁️ VIEW ANNOUNCEMENTS", b'view_announcements')]
-            ]
-            await event.edit(msg, buttons=keyboards, parse_mode='html')
-        return
+async def on_view_announcements(event):
+    if not system_state["daily_announcements"]:
+        await event.answer("📣 No announcements set yet!", alert=True)
+        return None
+    return view_announcements
 
-    elif data == b'back_main': pass
+async def on_delete_announcement(event, arg):
+    try:
+        idx = int(arg)
+        if 0 <= idx < len(system_state["daily_announcements"]):
+            deleted = system_state["daily_announcements"].pop(idx)
+            save_daily_announcements(system_state["daily_announcements"])
+            await event.answer(f"✅ Deleted announcement at {deleted['time']}", alert=True)
+    except:
+        await event.answer("❌ Error deleting announcement", alert=True)
+    return view_announcements if system_state["daily_announcements"] else view_main
 
-    msg = await get_panel_message()
-    keyboards = [
-        [Button.inline("🟢 FORCE START", b'force_start'), Button.inline("🔴 FORCE STOP", b'force_stop')],
-        [Button.inline("⏰ AUTO SCHEDULE", b'auto_mode'), Button.inline("📢 SELECT CHANNEL", b'select_channel')],
-        [Button.inline("🎮 CHANGE GAME NAME", b'change_game'), Button.inline("✏️ SET TIME", b'set_time')],
-        [Button.inline("🔧 SOLVE PROBLEM", b'solve_problem'), Button.inline("📅 VIEW SCHEDULES", b'view_schedules')],
-        [Button.inline("📣 ANNOUNCEMENT", b'announcement'), Button.inline("👁️ VIEW ANNOUNCEMENTS", b'view_announcements')]
-    ]
-    await event.edit(msg, buttons=keyboards, parse_mode='html')
+async def on_view_schedules(event):
+    if not system_state["daily_schedules"]:
+        await event.answer("📅 No schedules set yet!", alert=True)
+        return None
+    return view_schedules
+
+async def on_delete_schedule(event, arg):
+    try:
+        idx = int(arg)
+        if 0 <= idx < len(system_state["daily_schedules"]):
+            deleted = system_state["daily_schedules"].pop(idx)
+            save_daily_schedules(system_state["daily_schedules"])
+            await event.answer(f"✅ Deleted: {deleted['time']} | {deleted['game']}", alert=True)
+    except:
+        await event.answer("❌ Error deleting schedule", alert=True)
+    return view_schedules if system_state["daily_schedules"] else view_main
+
+async def on_back_main(event):
+    return view_main
+
+PANEL_ACTIONS = {
+    b'force_start': on_force_start,
+    b'force_stop': on_force_stop,
+    b'auto_mode': on_auto_mode,
+    b'select_channel': on_select_channel,
+    b'change_game': on_change_game,
+    b'set_time': on_set_time,
+    b'solve_problem': on_solve_problem,
+    b'announcement': on_announcement,
+    b'view_announcements': on_view_announcements,
+    b'view_schedules': on_view_schedules,
+    b'back_main': on_back_main
+}
+PANEL_PREFIX_ACTIONS = [
+    (b'ch_', on_channel_chosen),
+    (b'del_ann_', on_delete_announcement),
+    (b'del_sch_', on_delete_schedule)
+]
+
+async def handler(event):
+    if event.sender_id != ADMIN_ID: return
+    data = event.data
+    action = PANEL_ACTIONS.get(data)
+    if action:
+        view = await action(event)
+    else:
+        for prefix, prefix_action in PANEL_PREFIX_ACTIONS:
+            if data.startswith(prefix):
+                view = await prefix_action(event, data[len(prefix):].decode())
+                break
+        else:
+            view = view_main
+    if view:
+        request_panel_edit(event, view)
 
-@bot.on(events.NewMessage)
 async def input_handler(event):
     if event.sender_id != ADMIN_ID: return
     text = event.text.strip()
@@ -665,12 +1152,276 @@ async def input_handler(event):
         except Exception as e:
             await event.reply(f"⚠️ Invalid Format!\n\nExamples:\n19:30|19:50|BDG\n20:00|DAMAN")
 
+# ================= ANNOUNCEMENTS =================
+
+background_tasks = set()  # strong refs so fire-and-forget tasks aren't garbage collected
+
+async def deliver_announcements(announcements, target_channel):
+    """Send all announcements due this minute concurrently, then one admin digest"""
+    results = await asyncio.gather(
+        *[userbot.send_message(target_channel, ann['message'], parse_mode='html') for ann in announcements],
+        return_exceptions=True
+    )
+    lines = []
+    for ann, result in zip(announcements, results):
+        # Announcements are HTML; a truncated one can leave tags open, so show it as plain text
+        preview = html.escape(ann['message'][:30] + "..." if len(ann['message']) > 30 else ann['message'])
+        if isinstance(result, BaseException):
+            log(f"⚠️ Announcement error: {result}")
+            lines.append(f"❌ <code>{ann['time']}</code> {preview}\n   ⚠️ {html.escape(str(result))}")
+        else:
+            log(f"📣 Sent announcement: {ann['time']}")
+            lines.append(f"✅ <code>{ann['time']}</code> {preview}")
+    sent = sum(1 for result in results if not isinstance(result, BaseException))
+    try:
+        await bot.send_message(
+            ADMIN_ID,
+            f"📣 <b>ANNOUNCEMENTS</b> ({sent}/{len(announcements)} sent)\n\n" + "\n".join(lines),
+            parse_mode='html'
+        )
+    except Exception as e:
+        log(f"⚠️ Announcement digest error: {e}")
+
+# ================= STALL WATCHDOG =================
+
+WATCHDOG_INTERVAL = 0.25  # heartbeat period (seconds)
+WATCHDOG_STALL = 0.5      # heartbeat this late = a blocking call held the loop
+WATCHDOG_ALERT = 10       # stalls this long can make a period post miss its window
+
+class StallWatchdog:
+    """
+    Measures event-loop lag with a heartbeat coroutine. When the heartbeat
+    is overdue, a side thread samples the loop thread's stack to see which
+    call is blocking it. Keeps rolling lag percentiles, logs every stall with
+    its call site and alerts the admin about stalls that can delay posts.
+    """
+
+    def __init__(self):
+        self.lags = deque(maxlen=2400)  # ~10 minutes of heartbeats
+        self.stalls = deque(maxlen=10)
+        self._beat = time.monotonic()
+        self._sampled_beat = None
+        self._sample = None
+        self._loop_thread = None
+        self._last_alert = 0
+
+    def start(self):
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        threading.Thread(target=self._sampler, name="stall-watchdog", daemon=True).start()
+        task = asyncio.ensure_future(self._heartbeat())
+        background_tasks.add(task)
+
+    async def _heartbeat(self):
+        while True:
+            expected = time.monotonic() + WATCHDOG_INTERVAL
+            await asyncio.sleep(WATCHDOG_INTERVAL)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self.lags.append(lag)
+            self._beat = now
+            site, self._sample = self._sample, None
+            if lag >= WATCHDOG_STALL:
+                self._report(lag, site or "unknown")
+
+    def _sampler(self):
+        while True:
+            time.sleep(0.1)
+            beat = self._beat
+            if time.monotonic() - beat > WATCHDOG_STALL and self._sampled_beat != beat:
+                self._sampled_beat = beat
+                frame = sys._current_frames().get(self._loop_thread)
+                if frame: self._sample = self._call_site(frame)
+
+    @staticmethod
+    def _call_site(frame):
+        """Innermost frame in our own code, plus the library call it is stuck in"""
+        stack = traceback.extract_stack(frame)
+        here = os.path.dirname(os.path.abspath(__file__))
+        own = [f for f in stack if os.path.abspath(f.filename).startswith(here) and 'site-packages' not in f.filename]
+        site = own[-1] if own else stack[-1]
+        text = f"{os.path.basename(site.filename)}:{site.lineno} in {site.name}"
+        inner = stack[-1]
+        if inner is not site:
+            text += f" (blocked in {os.path.basename(inner.filename)}:{inner.lineno} {inner.name})"
+        return text
+
+    def percentiles(self):
+        lags = sorted(self.lags)
+        if not lags: return 0.0, 0.0, 0.0
+        pick = lambda q: lags[min(len(lags) - 1, int(q * len(lags)))]
+        return pick(0.5), pick(0.95), pick(0.99)
+
+    def summary(self):
+        p50, p95, p99 = self.percentiles()
+        return f"lag p50 {p50 * 1000:.0f}ms · p95 {p95 * 1000:.0f}ms · p99 {p99 * 1000:.0f}ms"
+
+    def _report(self, lag, site):
+        self.stalls.append((clock.now().strftime('%H:%M:%S'), lag, site))
+        log(f"🐢 Event loop stalled {lag:.1f}s at {site}")
+        if lag >= WATCHDOG_ALERT and time.monotonic() - self._last_alert > 60:
+            self._last_alert = time.monotonic()
+            task = asyncio.ensure_future(self._alert(lag, site))
+            background_tasks.add(task)
+            task.add_done_callback(background_tasks.discard)
+
+    async def _alert(self, lag, site):
+        try:
+            await bot.send_message(
+                ADMIN_ID,
+                f"🐢 <b>EVENT LOOP STALL</b>\n\n"
+                f"⏱ Blocked for <b>{lag:.1f}s</b> - period posts may miss their window\n"
+                f"📍 <code>{html.escape(site)}</code>\n"
+                f"📊 {self.summary()}",
+                parse_mode='html'
+            )
+        except: pass
+
+watchdog = StallWatchdog()
+
+async def send_lag_report(event):
+    if event.sender_id != ADMIN_ID: return
+    msg = f"📊 <b>EVENT LOOP</b>\n\n{watchdog.summary()}\n\n"
+    if watchdog.stalls:
+        msg += "🐢 <b>Recent stalls:</b>\n"
+        for at, lag, site in watchdog.stalls:
+            msg += f"<code>{at}</code> {lag:.1f}s - <code>{html.escape(site)}</code>\n"
+    else:
+        msg += "✅ No stalls recorded"
+    await event.respond(msg, parse_mode='html')
+
+# ================= HTTP API =================
+
+API_HISTORY_LIMIT = 100
+
+recent_draws = deque(maxlen=API_HISTORY_LIMIT)  # newest first, fed by save_to_db()
+api_state = {"period": None, "prediction": None, "accuracy": None}
+api_cache = {}  # (path, query) -> (version, etag, body)
+api_server = None
+API_NOT_READY = object()  # api_response() before the first period; answered 503, never cached
+
+def load_recent_draws():
+    try:
+        conn = sqlite3.connect(DB_FILE)
+        rows = conn.execute('SELECT period, number, ts FROM wingo_history ORDER BY period DESC LIMIT ?', (API_HISTORY_LIMIT,)).fetchall()
+        conn.close()
+        recent_draws.extend(draw_from_row(*row) for row in rows)
+    except: pass
+
+def api_status():
+    posting, status_msg = check_posting_status()
+    model = ml_state["model"]
+    return {
+        "mode": system_state["mode"],
+        "status": "🛑 STOPPED (4 Losses)" if system_state["stopped_by_losses"] else status_msg,
+        "posting": posting and not system_state["stopped_by_losses"],
+        "game_name": system_state["game_name"],
+        "channel": system_state["active_channel_name"],
+        "consecutive_losses": system_state["consecutive_losses"],
+        "model": {"val_acc": model["val_acc"], "samples": model["samples"]} if model else None
+    }
+
+def api_history(query):
+    try: limit = int(query.get("limit", ["20"])[0])
+    except ValueError: limit = 20
+    limit = max(1, min(limit, API_HISTORY_LIMIT))
+    draws = [
+        {"period": d["period"], "number": d["number"], "size": d["size"],
+         "color": d["color"].split(" ", 1)[-1], "time": d["time"]}
+        for d in list(recent_draws)[:limit]
+    ]
+    return {"draws": draws}, (limit,)
+
+def api_response(path, query):
+    """Body and ETag for a path, rebuilt only when its version (the period, or the shown state) changes"""
+    period = api_state["period"]
+    if path in ("/prediction", "/accuracy") and period is None:
+        return API_NOT_READY
+    if path == "/prediction":
+        version, key, build = period, (), lambda: api_state["prediction"]
+    elif path == "/accuracy":
+        version, key, build = period, (), lambda: api_state["accuracy"]
+    elif path == "/history":
+        payload, key = api_history(query)
+        version, build = period, lambda: payload
+    elif path == "/status":
+        payload = api_status()
+        version, key, build = json.dumps(payload, sort_keys=True), (), lambda: payload
+    else:
+        return None
+    cached = api_cache.get((path, key))
+    if cached and cached[0] == version:
+        return cached[1], cached[2]
+    body = json.dumps(build(), ensure_ascii=False).encode()
+    etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+    api_cache[(path, key)] = (version, etag, body)
+    return etag, body
+
+async def handle_api_request(reader, writer):
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), 10)
+        headers = {}
+        while True:
+            line = await asyncio.wait_for(reader.readline(), 10)
+            if line in (b"\r\n", b"\n", b""): break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        parts = request_line.decode("latin-1").split()
+        method, target = (parts[0], parts[1]) if len(parts) >= 2 else ("", "/")
+        url = urlsplit(target)
+
+        extra = ""
+        if method not in ("GET", "HEAD"):
+            status, etag, body = "405 Method Not Allowed", None, b'{"error": "read-only API"}'
+            extra = "Allow: GET, HEAD\r\n"
+        else:
+            result = api_response(url.path.rstrip("/") or "/", parse_qs(url.query))
+            if result is None:
+                status, etag, body = "404 Not Found", None, b'{"error": "not found"}'
+            elif result is API_NOT_READY:
+                status, etag, body = "503 Service Unavailable", None, b'{"error": "no period processed yet"}'
+                extra = "Retry-After: 5\r\n"
+            else:
+                etag, body = result
+                status = "200 OK"
+                if etag in [t.strip() for t in headers.get("if-none-match", "").split(",")]:
+                    status, body = "304 Not Modified", b""
+
+        head = f"HTTP/1.1 {status}\r\nContent-Type: application/json; charset=utf-8\r\n"
+        if etag: head += f"ETag: {etag}\r\nCache-Control: no-cache\r\n"
+        head += f"{extra}Content-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+        writer.write(head.encode() + (b"" if method == "HEAD" else body))
+        await writer.drain()
+    except Exception: pass
+    finally:
+        writer.close()
+
+async def start_api_server():
+    global api_server
+    api_server = await asyncio.start_server(handle_api_request, API_HOST, API_PORT)
+    log(f"🌐 HTTP API on http://{API_HOST}:{API_PORT} (/prediction /history /accuracy /status)")
+
 # ================= GAME LOOP =================
 
 async def game_loop():
     log("🚀 Aggressive Bot Started (No Waiting)...")
+    if watchdog:
+        watchdog.start()
     init_db()
-    warm_up_system()
+    init_feature_store()
+    load_recent_draws()
+    # Elect before warming up: only the fetcher downloads history, followers get its rows
+    if draw_cache:
+        await draw_cache.start()
+    if draw_cache and not draw_cache.is_fetcher:
+        save_to_db(draw_cache.warm_up_rows)
+    else:
+        rows = warm_up_system()
+        if draw_cache:
+            draw_cache.set_warm_up(rows)
+    if API_PORT:
+        await start_api_server()
+    start_ml_retrain()
     
     # Load daily schedules and announcements
     system_state["daily_schedules"] = load_daily_schedules()
@@ -691,22 +1442,12 @@ async def game_loop():
             if current_minute != last_schedule_check:
                 last_schedule_check = current_minute
                 
-                # Check for announcements to send
+                # Send due announcements in the background so the draw poll isn't held up
                 announcements = check_daily_announcements()
-                target_channel = system_state["active_channel_link"]
-                for announcement in announcements:
-                    try:
-                        await userbot.send_message(target_channel, announcement['message'], parse_mode='html')
-                        log(f"📣 Sent announcement: {announcement['time']}")
-                        await bot.send_message(
-                            ADMIN_ID,
-                            f"📣 <b>ANNOUNCEMENT SENT</b>\n\n"
-                            f"⏰ Time: <code>{announcement['time']}</code>\n"
-                            f"📝 Message sent to channel!",
-                            parse_mode='html'
-                        )
-                    except Exception as e:
-                        log(f"⚠️ Announcement error: {e}")
+                if announcements:
+                    task = asyncio.ensure_future(deliver_announcements(announcements, system_state["active_channel_link"]))
+                    background_tasks.add(task)
+                    task.add_done_callback(background_tasks.discard)
                 
                 # Check for schedule changes
                 schedule_action, schedule = check_daily_schedules()
@@ -768,21 +1509,10 @@ async def game_loop():
                     except:
                         pass
             
-            data = None
-            for domain in DOMAINS:
-                try:
-                    p = PARAMS.copy()
-                    p['ts'] = str(int(time.time() * 1000))
-                    r = requests.get(domain + API_PATH, params=p, headers=HEADERS, timeout=5, verify=False)
-                    if r.status_code == 200:
-                        temp = r.json()
-                        if "data" in temp and "list" in temp["data"]:
-                            data = temp
-                            break
-                except: continue
+            data = await get_history_page()
             
             if not data:
-                await asyncio.sleep(2)
+                await wait_next_cycle(2)
                 continue
 
             latest = data["data"]["list"][0]
@@ -798,18 +1528,32 @@ async def game_loop():
                 
                 save_to_db([{
                     "period": period, "number": number, "size": size, 
-                    "color": color, "time": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    "color": color, "time": clock.now().strftime('%Y-%m-%d %H:%M:%S')
                 }])
 
-                # --- SIMPLE TREND FOLLOWING ---
-                final_pred, final_conf = simple_trend_follow(size)
-                final_logic = "📈 Trend Following"
+                # --- PREDICTION (ML model when one is live, else trend following) ---
+                swap_ml_model()
+                final_pred, final_conf, final_logic = predict_next(size)
+                ml_state["draws_since_train"] += 1
+                if ml_state["draws_since_train"] >= ML_RETRAIN_EVERY:
+                    start_ml_retrain()
                 
                 last_prediction = final_pred
                 real_win_rate = 0
                 if acc_data["total_bets"] > 0:
                     real_win_rate = round((acc_data["wins"] / acc_data["total_bets"]) * 100, 1)
 
+                api_state["prediction"] = {
+                    "period": str(int(period) + 1), "prediction": final_pred,
+                    "confidence": round(final_conf, 1), "logic": final_logic,
+                    "last_draw": {"period": period, "number": number, "size": size}
+                }
+                api_state["accuracy"] = {
+                    "total_bets": acc_data["total_bets"], "wins": acc_data["wins"],
+                    "win_rate": real_win_rate, "last_10_results": list(acc_data["last_10_results"])
+                }
+                api_state["period"] = period
+
                 should_post, status_msg = check_posting_status()
                 target_channel = system_state["active_channel_link"]
 
@@ -828,7 +1572,7 @@ async def game_loop():
 
                 # Admin Log
                 try:
-                    await bot.send_message(ADMIN_ID, f"🎰 {system_state['game_name']} | {status_msg}\n🔢 {period[-3:]} | {number} ({size})\n🤖 Pred: <b>{final_pred}</b> ({round(final_conf)}%)\n🧠 {final_logic}{result_msg}", parse_mode='html')
+                    await bot.send_message(ADMIN_ID, f"🎰 {system_state['game_name']} | {status_msg}\n🔢 {period[-3:]} | {number} ({size})\n🤖 Pred: <b>{final_pred}</b> ({round(final_conf)}%)\n🧠 {final_logic}{color_pattern_note()}{result_msg}", parse_mode='html')
                 except: pass
 
                 # Update last result for next comparison
@@ -891,11 +1635,131 @@ async def game_loop():
 
                 last_period = period
 
-            await asyncio.sleep(5)
+            await wait_next_cycle(5)
 
         except Exception as e:
-            await asyncio.sleep(5)
+            await clock.sleep(5)
+
+# ================= SIMULATION =================
+
+class RecordingClient:
+    """Stands in for bot/userbot during a simulation and logs every send"""
+
+    def __init__(self, name, post_log):
+        self.name = name
+        self.post_log = post_log
+
+    def _record(self, kind, entity, content):
+        self.post_log.append({
+            "ist": get_ist_time().strftime('%Y-%m-%d %H:%M:%S'),
+            "client": self.name, "to": str(entity), "type": kind, "content": str(content)
+        })
+
+    async def send_message(self, entity, message, **kwargs):
+        self._record("message", entity, message)
+
+    async def send_file(self, entity, file, **kwargs):
+        self._record("file", entity, file)
+
+class InlineExecutor(Executor):
+    """Runs ML retrains synchronously so simulated model swaps are reproducible"""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try: future.set_result(fn(*args, **kwargs))
+        except Exception as e: future.set_exception(e)
+        return future
+
+def synthetic_period(ist):
+    return ist.strftime('%Y%m%d') + "1000" + f"{ist.hour * 60 + ist.minute + 1:05d}"
+
+def synthetic_page(seed, ist, size=10):
+    """API-shaped history page for the draws closed before `ist`, newest first"""
+    items = []
+    for i in range(1, size + 1):
+        period = synthetic_period(ist - timedelta(minutes=i))
+        number = random.Random(f"{seed}-{period}").randrange(10)
+        items.append({"issueNumber": period, "number": str(number)})
+    return {"data": {"list": items}}
+
+class SyntheticDrawSource:
+    """One seeded draw per simulated minute, served in the API's page layout"""
+
+    def __init__(self, seed):
+        self.seed = seed
+
+    def fetch_page(self, page=1, timeout=None):
+        return synthetic_page(self.seed, get_ist_time() - timedelta(minutes=10 * (page - 1)))
+
+async def run_simulation(args):
+    """
+    Drive game_loop() on a VirtualClock with synthetic draws (one per minute)
+    and recording clients, then write every post to args.out as JSON lines.
+    """
+    global clock, draw_source, bot, userbot, draw_cache, ml_pool, watchdog, DB_FILE, ACCURACY_FILE, SCHEDULE_FILE, ANNOUNCEMENT_FILE
+    start_ist = datetime.strptime(args.start, "%Y-%m-%d %H:%M")
+    start_utc = start_ist - timedelta(hours=5, minutes=30)
+    clock = VirtualClock(start_utc, start_utc + timedelta(hours=args.hours), args.speed)
+    draw_source = SyntheticDrawSource(args.seed)
+
+    post_log = []
+    bot = RecordingClient("bot", post_log)
+    userbot = RecordingClient("userbot", post_log)
+    draw_cache = None
+    watchdog = None  # measures real time, meaningless on a virtual clock
+    ml_pool = InlineExecutor()
+    random.seed(args.seed)
+
+    work_dir = args.work_dir
+    os.makedirs(work_dir, exist_ok=True)
+    DB_FILE = os.path.join(work_dir, "sim_history.db")
+    ACCURACY_FILE = os.path.join(work_dir, "sim_accuracy.json")
+    for path in (DB_FILE, ACCURACY_FILE):
+        if os.path.exists(path): os.remove(path)
+    if args.schedules: SCHEDULE_FILE = args.schedules
+    if args.announcements: ANNOUNCEMENT_FILE = args.announcements
+    if args.mode: system_state["mode"] = args.mode
+
+    started = time.time()
+    try:
+        await game_loop()
+    except SimulationFinished:
+        pass
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        for entry in post_log:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    channel_posts = sum(1 for entry in post_log if entry["client"] == "userbot")
+    print(f"Simulated {args.hours}h in {time.time() - started:.1f}s: "
+          f"{channel_posts} channel posts, {len(post_log) - channel_posts} admin messages -> {args.out}")
 
 if __name__ == '__main__':
-    with userbot:
-        userbot.loop.run_until_complete(game_loop())
+    parser = argparse.ArgumentParser(description="Daman WinGo bot")
+    parser.add_argument('--simulate', action='store_true', help="run on a virtual clock with synthetic draws, no Telegram")
+    parser.add_argument('--start', default="2024-01-01 00:00", help="simulated IST start (YYYY-MM-DD HH:MM)")
+    parser.add_argument('--hours', type=float, default=24, help="simulated duration")
+    parser.add_argument('--speed', type=float, default=0, help="time multiplier, e.g. 1000; 0 = as fast as possible")
+    parser.add_argument('--seed', type=int, default=1, help="seed for synthetic draws")
+    parser.add_argument('--mode', choices=["manual_on", "manual_off", "auto_time"], help="initial posting mode")
+    parser.add_argument('--schedules', help="daily schedule JSON to load instead of " + SCHEDULE_FILE)
+    parser.add_argument('--announcements', help="announcement JSON to load instead of " + ANNOUNCEMENT_FILE)
+    parser.add_argument('--work-dir', default="simulation", help="where the simulated DB and accuracy file go")
+    parser.add_argument('--out', default="sim_posts.jsonl", help="post log (JSON lines)")
+    args = parser.parse_args()
+
+    if args.simulate:
+        asyncio.run(run_simulation(args))
+        sys.exit(0)
+
+    create_clients()
+    bot.start(bot_token=BOT_TOKEN)
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(userbot.start())
+    try:
+        loop.run_until_complete(game_loop())
+    finally:
+        if draw_cache:
+            draw_cache.close()
+        if api_server:
+            api_server.close()
+        loop.run_until_complete(userbot.disconnect())
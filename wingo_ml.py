@@ -0,0 +1,236 @@
+import math
+import sqlite3
+import numpy as np
+from collections import deque
+
+# Kept free of Telethon/bot imports: this module is loaded inside the
+# training worker processes started by dmjson.py.
+
+HISTORY_WINDOW = 60     # draws seen before feature vectors are emitted; also caps run lengths
+GAP_CAP = 50            # "draws since number N appeared" is capped here
+N_ROUNDS = 80
+LEARNING_RATE = 0.1
+L2_REG = 1.0
+MAX_THRESHOLDS = 16
+VALIDATION_SPLIT = 0.2
+ACCEPT_MARGIN = 0.02    # hold-out accuracy a new model needs above trend following / the live model
+
+FEATURE_NAMES = (
+    [f"size_lag_{i}" for i in range(1, 6)] +
+    [f"number_lag_{i}" for i in range(1, 4)] +
+    ["size_streak", "big_ratio_10", "big_ratio_20", "color", "color_run"] +
+    [f"gap_{n}" for n in range(10)] +
+    ["green_ratio_20", "red_ratio_20", "violet_ratio_20"]
+)
+
+# ================= FEATURES =================
+
+def color_code(n):
+    """0 = Green, 1 = Red, 2 = Violet (same split as get_color())"""
+    if n in (0, 5): return 2
+    if n in (1, 3, 7, 9): return 0
+    return 1
+
+class FeatureTracker:
+    """
+    Rolling features over the draws seen so far, updated in O(1) per draw.
+    vector() after draw i describes the history up to and including draw i,
+    i.e. it is the input for predicting draw i + 1.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.last_period = None
+        self._numbers = deque(maxlen=20)
+        self._big_10 = 0
+        self._big_20 = 0
+        self._color_counts = [0, 0, 0]
+        self._streak = 0
+        self._color_run = 0
+        self._last_seen = [None] * 10
+
+    @property
+    def ready(self):
+        return self.count >= HISTORY_WINDOW
+
+    def push(self, number, period=None):
+        numbers = self._numbers
+        big = 1 if number >= 5 else 0
+        color = color_code(number)
+
+        if numbers and (numbers[-1] >= 5) == bool(big):
+            self._streak = min(self._streak + 1, HISTORY_WINDOW)
+        else:
+            self._streak = 1
+        if numbers and color_code(numbers[-1]) == color:
+            self._color_run = min(self._color_run + 1, HISTORY_WINDOW)
+        else:
+            self._color_run = 1
+
+        if len(numbers) >= 10 and numbers[-10] >= 5: self._big_10 -= 1
+        if len(numbers) == 20:
+            oldest = numbers[0]
+            if oldest >= 5: self._big_20 -= 1
+            self._color_counts[color_code(oldest)] -= 1
+        numbers.append(number)
+        self._big_10 += big
+        self._big_20 += big
+        self._color_counts[color] += 1
+
+        self._last_seen[number] = self.count
+        self.count += 1
+        if period is not None: self.last_period = period
+
+    def vector(self):
+        numbers = self._numbers
+        vec = [1 if numbers[-i] >= 5 else 0 for i in range(1, 6)]
+        vec += [numbers[-i] for i in range(1, 4)]
+        vec += [self._streak, self._big_10 / 10, self._big_20 / 20]
+        vec += [color_code(numbers[-1]), self._color_run]
+        vec += [GAP_CAP if seen is None else min(self.count - 1 - seen, GAP_CAP) for seen in self._last_seen]
+        vec += [c / 20 for c in self._color_counts]
+        return vec
+
+def pack_features(vec):
+    return np.asarray(vec, dtype='<f8').tobytes()
+
+def unpack_features(blob):
+    return np.frombuffer(blob, dtype='<f8')
+
+def load_feature_dataset(db_file):
+    """Precomputed vectors from wingo_features, paired with the size of the draw that followed"""
+    conn = sqlite3.connect(db_file)
+    rows = conn.execute('''
+        SELECT f.features, h.number FROM wingo_history h
+        LEFT JOIN wingo_features f ON f.period = h.period
+        ORDER BY h.period
+    ''').fetchall()
+    conn.close()
+    X, y = [], []
+    for (blob, _), (_, next_number) in zip(rows, rows[1:]):
+        if blob is None: continue
+        X.append(unpack_features(blob))
+        y.append(1 if next_number >= 5 else 0)
+    if not X: return np.empty((0, len(FEATURE_NAMES))), np.empty(0)
+    return np.array(X), np.array(y, dtype=np.float64)
+
+# ================= PATTERN INDEX =================
+
+class PatternIndex:
+    """
+    Next-outcome counts for every k-gram (k <= max_k) of an encoded sequence
+    (sizes: 0/1, colors: color_code), over a sliding window of draws.
+    The codes of the current suffixes are kept up to date, so push() costs
+    O(max_k) and next_counts(k) is a single dict lookup.
+    """
+
+    def __init__(self, alphabet, max_k=8, window=2000):
+        self.alphabet = alphabet
+        self.max_k = max_k
+        self.window = window
+        self.counts = {}  # (k, code of k symbols, oldest most significant) -> count per next symbol
+        self._symbols = deque()
+        self._suffix = [0] * (max_k + 1)
+
+    def push(self, symbol):
+        symbols = self._symbols
+        for k in range(1, min(self.max_k, len(symbols)) + 1):
+            key = (k, self._suffix[k])
+            if key not in self.counts: self.counts[key] = [0] * self.alphabet
+            self.counts[key][symbol] += 1
+        for k in range(self.max_k, 0, -1):
+            self._suffix[k] = self._suffix[k - 1] * self.alphabet + symbol
+        symbols.append(symbol)
+        if len(symbols) > self.window: self._evict()
+
+    def _evict(self):
+        """Drop the oldest symbol with every (context -> next) pair whose context starts at it"""
+        symbols = self._symbols
+        code = 0
+        for k in range(1, min(self.max_k, len(symbols) - 1) + 1):
+            code = code * self.alphabet + symbols[k - 1]
+            self.counts[(k, code)][symbols[k]] -= 1
+        symbols.popleft()
+
+    def next_counts(self, k):
+        """Counts of each symbol that followed the current last-k symbols in the window"""
+        if k > self.max_k or k > len(self._symbols): return None
+        return self.counts.get((k, self._suffix[k]), [0] * self.alphabet)
+
+    def best_match(self, min_support):
+        """Longest current suffix seen at least min_support times: (k, counts) or (0, None)"""
+        for k in range(min(self.max_k, len(self._symbols)), 0, -1):
+            counts = self.next_counts(k)
+            if sum(counts) >= min_support: return k, counts
+        return 0, None
+
+# ================= GRADIENT BOOSTING =================
+
+def _candidate_thresholds(column):
+    values = np.unique(column)
+    if len(values) > MAX_THRESHOLDS:
+        values = np.unique(np.quantile(column, np.linspace(0, 1, MAX_THRESHOLDS)))
+    return values[:-1]
+
+def _fit(X, y):
+    base = float(np.log((y.mean() + 1e-6) / (1 - y.mean() + 1e-6)))
+    raw = np.full(len(y), base)
+    thresholds = [_candidate_thresholds(X[:, f]) for f in range(X.shape[1])]
+    stumps = []
+    for _ in range(N_ROUNDS):
+        p = 1 / (1 + np.exp(-raw))
+        g, h = p - y, p * (1 - p)
+        G, H = g.sum(), h.sum()
+        best = None
+        for f, thr in enumerate(thresholds):
+            if len(thr) == 0: continue
+            left = X[:, f][:, None] <= thr[None, :]
+            GL, HL = g @ left, h @ left
+            GR, HR = G - GL, H - HL
+            gain = GL ** 2 / (HL + L2_REG) + GR ** 2 / (HR + L2_REG)
+            j = int(np.argmax(gain))
+            if best is None or gain[j] > best[0]:
+                best = (gain[j], f, thr[j], -GL[j] / (HL[j] + L2_REG), -GR[j] / (HR[j] + L2_REG))
+        if best is None: break
+        _, f, thr, left_value, right_value = best
+        stump = (f, float(thr), float(left_value * LEARNING_RATE), float(right_value * LEARNING_RATE))
+        stumps.append(stump)
+        raw += np.where(X[:, f] <= thr, stump[2], stump[3])
+    return {"base": base, "stumps": stumps}
+
+def predict_proba(model, vec):
+    """P(next draw is Big) for one feature vector; plain Python so it stays sub-millisecond"""
+    raw = model["base"]
+    for f, thr, left_value, right_value in model["stumps"]:
+        raw += left_value if vec[f] <= thr else right_value
+    return 1 / (1 + math.exp(-raw))
+
+def _accuracy(model, X, y):
+    hits = sum((predict_proba(model, x) >= 0.5) == bool(t) for x, t in zip(X, y))
+    return hits / len(y)
+
+def train_model(X, y, prev_model=None):
+    """
+    Fit on the older part of the history and validate on the newest draws.
+    The model is marked accepted only if it beats both trend following and the
+    model currently in use on the same hold-out draws by ACCEPT_MARGIN.
+    prev_acc is the live model's accuracy on those draws (None without one),
+    so the caller can retire a live model that now loses to trend following.
+    """
+    if len(y) < 100: return None
+    split = int(len(y) * (1 - VALIDATION_SPLIT))
+    model = _fit(X[:split], y[:split])
+    X_val, y_val = X[split:], y[split:]
+
+    model["val_acc"] = _accuracy(model, X_val, y_val)
+    # Trend following repeats the last size, which is feature 0
+    model["baseline_acc"] = float(np.mean(X_val[:, 0] == y_val))
+    model["prev_acc"] = _accuracy(prev_model, X_val, y_val) if prev_model else None
+    model["accepted"] = model["val_acc"] > max(model["baseline_acc"], model["prev_acc"] or 0.0) + ACCEPT_MARGIN
+    model["samples"] = len(y)
+    return model
+
+def train_from_db(db_file, prev_model=None):
+    """Process-pool entry point: read the feature table itself so the bot's loop never does"""
+    X, y = load_feature_dataset(db_file)
+    return train_model(X, y, prev_model)